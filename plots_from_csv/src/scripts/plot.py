@@ -11,18 +11,23 @@ Dependencies:
 - CSV files located in the "data" folder
 '''
 
-import ast
 from bokeh.layouts import column, row
 from bokeh.models import CDSView, ColumnDataSource, CustomJS, DataTable, DatetimeTickFormatter
 from bokeh.models import HTMLTemplateFormatter, HoverTool, IndexFilter, TableColumn, TapTool
 from bokeh.plotting import figure
 from bokeh.transform import linear_cmap
-import math
+import numpy as np
 import pandas as pd
+import re
 import xyzservices.providers as xyz
 
 PARKING_HISTORY_CSV_FILEPATH = "./data/parking_occupancy_history.csv"
 GENERAL_INFO_CSV_FILEPATH = "./data/parking_general_information.csv"
+CAPACITY_PATTERN = re.compile(r"""['"]?mv:maximumValue['"]?\s*:\s*(\d+)""")
+ADDRESS_PATTERNS = [
+    re.compile(r"""['"]%s['"]?\s*:\s*['"]?(.*?)['"]?\s*(?:,\s*['"]schema:|\})""" % re.escape(address_key))
+    for address_key in ["schema:streetAddress", "schema:postalCode", "schema:addressLocality"]
+]
 
 PARKING_ID_HOMEPAGE = 'LPA0740'
 DATA_TABLE_COLUMNS_FILTER = [
@@ -36,86 +41,85 @@ DATA_TABLE_COLUMNS_FILTER = [
     "tarifs",
     "adresse"
 ]
+LINE_PLOT_COLUMNS = ["date", "nombre_de_places_disponibles", "parking", "site_web"]
 LATITUDE_LYON = 45.764043
 LONGITUDE_LYON = 4.835659
 CIRCLE_SIZE_BOUNDS = (10, 25)
 ZOOM_LEVEL = 10000
 
-def get_address(string_dict):
+def get_address(address_series):
     """
-    Extract an address from a string representing a dictionary.
+    Extract addresses from a Series of strings representing dictionaries.
+
+    Each field is extracted over the whole Series with its precompiled pattern from "ADDRESS_PATTERNS",
+    a value ending where the next 'schema:' key or the closing brace starts.
 
     Parameters:
-    - string_dict (str): A string containing address information.
+    - address_series (pd.Series): Strings containing address information.
 
     Returns:
-    - str: A formatted address string (street, postal code, locality).
+    - pd.Series: Formatted address strings (street, postal code, locality).
     """
 
-    address_keys = ["schema:streetAddress", "schema:postalCode", "schema:addressLocality"]
-    string_dict = string_dict.strip('"').replace('"', "'")
-    string_dict = string_dict.replace("': ", '": "').replace(", '", '", "').replace("'\"", '"' ).replace("\"'", '"' ).replace("{'", '{"').replace("'}", '"}')
-    address_dict = ast.literal_eval(string_dict)
-    address = [str(address_dict.get(key)) for key in address_keys]
-    adress_string = " ".join(address)
+    address_fields = [address_series.str.extract(pattern, expand=False) for pattern in ADDRESS_PATTERNS]
 
-    return adress_string
+    return address_fields[0] + " " + address_fields[1] + " " + address_fields[2]
 
 def get_parking_capacity(capacity_str):
     """
     Parse and retrieve the 'mv:maximumValue' from a string representing a list of dictionaries.
 
     The input string contains data in a JSON-like format, and this function extracts the 
-    'mv:maximumValue' from the last dictionary in the list.
+    'mv:maximumValue' from the last dictionary in the list. The value is matched with
+    "CAPACITY_PATTERN" from the last opening brace, without parsing the whole list.
 
     Parameters:
     - capacity_str (str): A string representation of a list of dictionaries.
 
     Returns:
     - int or None: The value of the 'mv:maximumValue' key, or None if the key is not present.
-    
-    Raises:
-    - ValueError: If the input string cannot be evaluated as a valid list of dictionaries.
     """
+    match = CAPACITY_PATTERN.search(capacity_str, capacity_str.rfind("{"))
 
-    str_clean = capacity_str.replace("'", '"')
-    str_clean = str_clean.replace(": ,", ': None,')
-    data_list = eval(str_clean)
-    last_dict = data_list[-1]
+    return int(match.group(1)) if match else None
 
-    return last_dict.get("mv:maximumValue")
-
-def clean_phone_number(phone_number):
+def clean_phone_number(phone_series):
     """
-    Format a phone number by ensuring it starts with '0' and adding spaces every 2 digits.
+    Format phone numbers by ensuring they start with '0' and adding spaces every 2 digits.
+
+    The formatting is done with vectorized string operations over the whole Series.
 
     Parameters:
-    - phone_number (int or str): The input phone number.
+    - phone_series (pd.Series): The input phone numbers, missing values as NaN.
 
     Returns:
-    - str: A formatted phone number (e.g., "01 23 45 67 89").
+    - pd.Series: Formatted phone numbers (e.g., "01 23 45 67 89"), missing values kept as NaN.
     """
-    if not pd.isna(phone_number): 
-        phone_number = "0" + str(int(phone_number))
-        phone_number_slices_list = [phone_number[i: i+2] for i in range(0, 10, 2)]
-        phone_number = " ".join(phone_number_slices_list)
-    return phone_number
+    phone_numbers = "0" + phone_series.astype("Int64").astype(str)
+    formatted_phone_numbers = (
+        phone_numbers.str[0:2] + " " + phone_numbers.str[2:4] + " " + phone_numbers.str[4:6]
+        + " " + phone_numbers.str[6:8] + " " + phone_numbers.str[8:10]
+    )
+
+    return formatted_phone_numbers.where(phone_series.notna())
     
 def latlon_to_webmercator(lat, lon):
     """
     Convert latitude and longitude to Web Mercator coordinates.
+
+    Accepts scalars or NumPy arrays, so a whole DataFrame column can be converted in one call.
     
     Parameters:
-    - lat (float): Latitude in degrees
-    - lon (float): Longitude in degrees
+    - lat (float or np.ndarray): Latitude in degrees
+    - lon (float or np.ndarray): Longitude in degrees
     
     Returns:
-    - (float, float): Web Mercator x, y coordinates
+    - (float, float) or (np.ndarray, np.ndarray): Web Mercator x, y coordinates
     """
 
     R = 6378137  # Radius of the Earth in meters (WGS 84 standard)
-    x = R * math.radians(lon)  # Convert longitude to radians and scale
-    y = R * math.log(math.tan(math.pi / 4 + math.radians(lat) / 2))  # Transform latitude
+    x = R * np.radians(lon)  # Convert longitude to radians and scale
+    y = R * np.log(np.tan(np.pi / 4 + np.radians(lat) / 2))  # Transform latitude
 
     return x, y
 
@@ -137,9 +141,10 @@ def normalize_number(nb, data_range, expected_range):
         - expected_range[1] (float): The upper bound of the desired target range.
 
     Returns:
-    - float: The normalized value scaled to fit within the `expected_range`.
+    - float: The normalized value scaled to fit within the `expected_range`. The middle of
+        `expected_range` is returned when `data_range` is empty.
     """
-    result = nb
+    result = (expected_range[0] + expected_range[1]) / 2
 
     if (data_range[1] - data_range[0]) != 0:
         result = expected_range[0] + (nb - data_range[0]) / (data_range[1] - data_range[0]) * (expected_range[1] - expected_range[0])
@@ -161,16 +166,25 @@ def prepare_general_info_dataframe(csv_filepath):
     - pd.DataFrame: A cleaned DataFrame with standardized columns for further processing.
     """
 
-    df_general_info = pd.read_csv(csv_filepath, sep=";")
-    df_general_info['adresse'] = df_general_info['address'].apply(get_address)
-    df_general_info['capacité_total'] = df_general_info['capacity'].apply(get_parking_capacity)
-    df_general_info['téléphone'] = df_general_info['telephone'].apply(clean_phone_number)
-    df_general_info['lat'] = df_general_info['lat'].astype(str).str.replace(',', '.').astype(float)
-    df_general_info['lon'] = df_general_info['lon'].astype(str).str.replace(',', '.').astype(float)
-    df_general_info[["lon_mercator", "lat_mercator"]] = df_general_info.apply(
-        lambda row: pd.Series(latlon_to_webmercator(row["lat"], row["lon"])),
-        axis=1
+    # Coordinates use a comma as decimal separator; height limits are kept as displayed strings.
+    # Only the columns used below are parsed, out of the 24 columns of the file.
+    df_general_info = pd.read_csv(
+        csv_filepath,
+        sep=";",
+        decimal=",",
+        usecols=['identifier', 'name', 'url', 'address', 'numberoflevels', 'vehicleheightlimitinm',
+                 'telephone', 'capacity', 'resumetarifshoraires', 'lon', 'lat'],
+        dtype={"vehicleheightlimitinm": str}
+    )
+    df_general_info['adresse'] = get_address(df_general_info['address'])
+    df_general_info['capacité_total'] = df_general_info['capacity'].map(get_parking_capacity)
+    df_general_info['téléphone'] = clean_phone_number(df_general_info['telephone'])
+    df_general_info["lon_mercator"], df_general_info["lat_mercator"] = latlon_to_webmercator(
+        df_general_info["lat"].to_numpy(),
+        df_general_info["lon"].to_numpy()
     )
+    # float32 keeps Web Mercator coordinates to well under a metre, with half the bytes sent to the browser
+    df_general_info[["lon_mercator", "lat_mercator"]] = df_general_info[["lon_mercator", "lat_mercator"]].astype(np.float32)
     df_general_info["resumetarifshoraires"] = df_general_info["resumetarifshoraires"].fillna(" ")
     df_general_info.rename(
         columns={
@@ -217,51 +231,71 @@ def prepare_global_dataframe(df_general_info, df_parking_history):
         )
     
 
-    df_global['heure'] = df_global['date'].apply(lambda x: x.strftime('%d %B %Y %H:%M:%S'))
+    df_global['heure'] = df_global['date'].dt.strftime('%d %B %Y %H:%M:%S')
     df_global.rename(
     columns={
         "nb_of_available_parking_spaces": "nombre_de_places_disponibles",
         },
     inplace=True
     )
+    # Available spaces fit in 16 bits, which halves the history buffers sent to the browser
+    df_global['nombre_de_places_disponibles'] = df_global['nombre_de_places_disponibles'].astype(np.int16)
+    # The left merge turns general information integers into float64, nullable integers keep them small
+    df_global['capacité_total'] = df_global['capacité_total'].astype('Int32')
+    df_global['nombre de niveaux'] = df_global['nombre de niveaux'].astype('Int16')
     df_global.sort_values('date', inplace=True)
 
     return df_global
 
-def prepare_sources(df_global, initial_parking_id=PARKING_ID_HOMEPAGE, data_table_columns_filter=DATA_TABLE_COLUMNS_FILTER):
+def prepare_sources(
+        df_global,
+        initial_parking_id=PARKING_ID_HOMEPAGE,
+        data_table_columns_filter=DATA_TABLE_COLUMNS_FILTER,
+        line_plot_columns=LINE_PLOT_COLUMNS
+        ):
     """
     Prepares data sources for visualizations.
 
-    Generates ColumnDataSource objects for the global data, line plot, map, 
+    Generates the history of each parking, and ColumnDataSource objects for the line plot, map,
     and a transposed table based on the most recent values and selected parking.
+    Histories only hold `line_plot_columns`, general information is sent once per parking with the map.
 
     Parameters:
     - df_global (pd.DataFrame): The merged global DataFrame with parking data.
     - initial_parking_id (int): ID of the parking lot to initialize plots.
     - data_table_columns_filter (list): List of columns to include in the table.
+    - line_plot_columns (list): List of history columns used by the line plot and the URL table.
 
     Returns:
-    - tuple: Sources for global data, line plot, map, and transposed table.
+    - tuple: History data by parking ID, and sources for line plot, map, and transposed table.
     """
 
-    df_more_recent_value = df_global.groupby('parking_id').agg({'date': 'max'})
-
-    df_map = df_global.merge(df_more_recent_value , on=['parking_id', 'date'])
+    # df_global is sorted by date, so the last row of each parking is its most recent record
+    df_map = df_global.drop_duplicates('parking_id', keep='last', ignore_index=True)
+    # Histories are bucketed once, so the selection callback swaps the line plot data with a single lookup
+    history_by_parking = {
+        parking_id: {column: df_parking[column].to_numpy() for column in line_plot_columns}
+        for parking_id, df_parking in df_global.groupby('parking_id')
+    }
 
-    df_line_plot = df_global[df_global['parking_id']==initial_parking_id]
     df_table = df_map[df_map['parking_id']==initial_parking_id]
 
     transposed_data = {
         "Field": data_table_columns_filter,
-        "Value": [df_table.iloc[0][col] for col in data_table_columns_filter]
+        "Value": df_table[data_table_columns_filter].iloc[0].tolist()
     }
 
-    source_original = ColumnDataSource(df_global)
-    source_line_plot = ColumnDataSource(df_line_plot)
-    source_map = ColumnDataSource(df_map)
+    source_line_plot = ColumnDataSource(history_by_parking[initial_parking_id])
+    # Nullable integers with missing values would fall back to float64, they are sent as float32 with NaN instead
+    source_map = ColumnDataSource(data={
+        column: df_map[column].to_numpy(dtype=np.float32, na_value=np.nan)
+        if pd.api.types.is_extension_array_dtype(df_map[column]) and df_map[column].hasnans
+        else df_map[column].to_numpy()
+        for column in df_map.columns
+    })
     source_table = ColumnDataSource(transposed_data)
 
-    return source_original, source_line_plot, source_map, source_table
+    return history_by_parking, source_line_plot, source_map, source_table
 
 def add_circle_size_to_source_map(source_map, circle_size_bounds=CIRCLE_SIZE_BOUNDS):
     """
@@ -275,12 +309,15 @@ def add_circle_size_to_source_map(source_map, circle_size_bounds=CIRCLE_SIZE_BOU
     - None: Updates `source_map` in place with a `normalized_circle_size` field.
     """
 
-    available_spaces_range = (
-        min(source_map.data["nombre_de_places_disponibles"]),
-        max(source_map.data["nombre_de_places_disponibles"])
-        )
-    normalized_circle_sizes = [normalize_number(x, available_spaces_range, circle_size_bounds)
-                        for x in source_map.data["nombre_de_places_disponibles"]]
+    # Normalized once over the whole column as a NumPy array
+    available_spaces = np.asarray(source_map.data["nombre_de_places_disponibles"], dtype=np.float64)
+    available_spaces_range = (available_spaces.min(), available_spaces.max())
+    # np.full also broadcasts the single middle size returned when every parking has the same value
+    normalized_circle_sizes = np.full(
+        available_spaces.shape,
+        normalize_number(available_spaces, available_spaces_range, circle_size_bounds),
+        dtype=np.float32
+    )
     source_map.data['normalized_circle_size'] = normalized_circle_sizes
 
 def generate_map_plot(source_map, lyon_x, lyon_y, zoom_level=ZOOM_LEVEL):
@@ -295,10 +332,11 @@ def generate_map_plot(source_map, lyon_x, lyon_y, zoom_level=ZOOM_LEVEL):
     Returns:
     - Figure: Bokeh map plot with hover and selection tools.
     """
+    # Without low and high bounds, the browser infers them from the data it already holds
     color_mapper = linear_cmap(field_name="nombre_de_places_disponibles",
                             palette="Viridis256",
-                            low=min(source_map.data["nombre_de_places_disponibles"]),
-                            high=max(source_map.data["nombre_de_places_disponibles"]))
+                            low=None,
+                            high=None)
 
     hover_map = HoverTool(
         tooltips = [
@@ -437,7 +475,7 @@ def generate_data_table_url(source_line_plot):
     
     return data_url
 
-def create_selection_callback(source_map, source_line_plot, source_table, source_original, p_line):
+def create_selection_callback(source_map, source_line_plot, source_table, history_by_parking, p_line):
     """
     Creates a CustomJS callback for updating data source based on user selection.
     
@@ -445,7 +483,7 @@ def create_selection_callback(source_map, source_line_plot, source_table, source
     - source_map (ColumnDataSource): The source for the map data.
     - source_line_plot (ColumnDataSource): The source for the line plot data.
     - source_table (ColumnDataSource): The source for the data table.
-    - source_original (ColumnDataSource): The source for the original dataset.
+    - history_by_parking (dict[str, dict[str, np.ndarray]]): History data of each parking, by parking ID.
     - p_line (Figure): Bokeh step plot.
     
     Returns:
@@ -456,39 +494,36 @@ def create_selection_callback(source_map, source_line_plot, source_table, source
             s_map=source_map,
             s_line=source_line_plot,
             s_table=source_table,
-            s_original=source_original,
+            history_by_parking=history_by_parking,
             p_line=p_line),
         code=
         """
         var data_map = s_map.data
-        var data_original = s_original.data
         var selected_index = cb_obj.indices[0]
                                         
         if (selected_index !== undefined) {
             var parking_id = data_map['identifier'][selected_index]
 
-            // Update s_line
-            var line_plot_data = {};
-            for (var key in data_original) {
-                line_plot_data[key] = [];
-            }
-
-            for (var i = 0; i < data_original['parking_id'].length; i++) {
-                if (data_original['parking_id'][i] === parking_id) {
-                    for (var key in data_original) {
-                        line_plot_data[key].push(data_original[key][i]);
-                    }
-                }
-            }
+            // Update s_line with the history of the selected parking bucketed in Python
+            var line_plot_data = history_by_parking[parking_id]
 
             s_line.data = line_plot_data
             s_line.change.emit()
 
-            // Specify new axis range for the history plots 
-            var x_min = Math.min(...line_plot_data['date'].map(d => new Date(d).getTime()));
-            var x_max = Math.max(...line_plot_data['date'].map(d => new Date(d).getTime()));
-            var y_min = Math.min(...line_plot_data['nombre_de_places_disponibles']);
-            var y_max = Math.max(...line_plot_data['nombre_de_places_disponibles']);
+            // Specify new axis range for the history plots, with a single pass over dates and values
+            // Datetime columns are sent by Bokeh as float64 milliseconds since epoch
+            var line_plot_dates = line_plot_data['date']
+            var line_plot_values = line_plot_data['nombre_de_places_disponibles']
+            var x_min = Infinity, x_max = -Infinity, y_min = Infinity, y_max = -Infinity;
+
+            for (var i = 0; i < line_plot_dates.length; i++) {
+                var time = line_plot_dates[i];
+                if (time < x_min) { x_min = time; }
+                if (time > x_max) { x_max = time; }
+                var value = line_plot_values[i];
+                if (value < y_min) { y_min = value; }
+                if (value > y_max) { y_max = value; }
+            }
 
             var x_padding = 0.1 * (x_max - x_min);
             var y_padding = 0.1 * (y_max - y_min);
@@ -497,17 +532,7 @@ def create_selection_callback(source_map, source_line_plot, source_table, source
             p_line.y_range.setv({ start: y_min - y_padding, end: y_max + y_padding });
             p_line.change.emit();
 
-            // Update s_table
-            var max_date_index = 0
-            var max_date = new Date(Math.max(...line_plot_data['date'].map(d => new Date(d))))
-
-            for (var i = 0; i < line_plot_data['date'].length; i++) {
-                if (new Date(line_plot_data['date'][i]).getTime() === max_date.getTime()) {
-                    max_date_index = i;
-                    break;
-                }
-            }
-
+            // Update s_table from the map row, which holds the most recent record of the selected parking
             var filter_columns = ["parking", "heure", "capacité_total", "nombre_de_places_disponibles", "nombre de niveaux", "hauteur limite (mètre)", "téléphone", "tarifs", "adresse"];
             var table_data = {
                 "Field": [],
@@ -515,7 +540,7 @@ def create_selection_callback(source_map, source_line_plot, source_table, source
             };
 
             for (var key of filter_columns) {
-                var value = line_plot_data[key][max_date_index];
+                var value = data_map[key][selected_index];
 
                 table_data["Field"].push(key);
                 table_data["Value"].push(value);
@@ -536,9 +561,14 @@ def main():
     - Builds and returns a cohesive Bokeh layout.
     """
     df_general_info = prepare_general_info_dataframe(GENERAL_INFO_CSV_FILEPATH)
-    df_parking_history = pd.read_csv(PARKING_HISTORY_CSV_FILEPATH, index_col='id', parse_dates=[4])
+    # Only the columns used by the plots are read, the record ids and closing flags are never displayed
+    df_parking_history = pd.read_csv(
+        PARKING_HISTORY_CSV_FILEPATH,
+        usecols=['parking_id', 'nb_of_available_parking_spaces', 'date'],
+        parse_dates=['date']
+        )
     df_global = prepare_global_dataframe(df_general_info, df_parking_history)
-    source_original, source_line_plot, source_map, source_table = prepare_sources(df_global)
+    history_by_parking, source_line_plot, source_map, source_table = prepare_sources(df_global)
     add_circle_size_to_source_map(source_map, circle_size_bounds=CIRCLE_SIZE_BOUNDS)
     lyon_x, lyon_y = latlon_to_webmercator(LATITUDE_LYON, LONGITUDE_LYON)
     p_map = generate_map_plot(source_map, lyon_x, lyon_y, zoom_level=ZOOM_LEVEL)
@@ -547,7 +577,7 @@ def main():
     data_table_url = generate_data_table_url(source_line_plot)
     callback = create_selection_callback(source_map, source_line_plot,
                                          source_table,
-                                         source_original,
+                                         history_by_parking,
                                          p_line)
     source_map.selected.js_on_change('indices', callback)
 
@@ -161,11 +161,16 @@ def rename_columns(batch_df, required_columns_set):
 
     Returns:
     pd.DataFrame: DataFrame with renamed columns according to the mapping.
+
+    Raises:
+    - ValueError: If the DataFrame does not contain all required columns.
     """
-    if not required_columns_set.issubset(batch_df.columns):
-        error_msg = "JSON does not contain expected columns."
+    missing_columns = required_columns_set - set(batch_df.columns)
+
+    if missing_columns:
+        error_msg = f"JSON does not contain expected columns. Missing columns: {missing_columns}"
         logger.error(error_msg)
-        raise ValueError()
+        raise ValueError(error_msg)
     
     columns_renamer = {
         "mv:currentValue": "nb_of_available_parking_spaces",
@@ -3,7 +3,8 @@ Unit tests for functions of module collect_data.py.
 
 This script provides test cases for the "parking_state_has_changed" and 
 "collect_changes" functions, ensuring their correctness in detecting and 
-updating parking state changes based on new data.
+updating parking state changes based on new data, and for the "rename_columns"
+function when the fetched JSON misses required columns.
 """
 
 import os
@@ -13,7 +14,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src'
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/scripts')))
 
 import pandas as pd
-from scripts.collect_data import parking_state_has_changed, collect_changes
+from scripts.collect_data import parking_state_has_changed, collect_changes, rename_columns
 import time
 import unittest
 
@@ -80,5 +81,18 @@ class TestParkingState(unittest.TestCase):
         self.assertListEqual(changes_list, changes_list_target, "Changes list should match the expected target changes.")
         pd.testing.assert_frame_equal(df_state_updated, df_state_target, check_dtype=False)
 
+    def test_rename_columns_missing_columns(self):
+        """
+        Test that rename_columns reports which required columns are missing.
+        """
+        batch_df = pd.DataFrame(columns=["mv:currentValue", "ferme"])
+        required_columns_set = {"mv:currentValue", "ferme", "Parking_schema:identifier", "dct:date"}
+
+        with self.assertRaises(ValueError) as context:
+            rename_columns(batch_df, required_columns_set)
+
+        expected_msg = f"Missing columns: {required_columns_set - set(batch_df.columns)}"
+        self.assertIn(expected_msg, str(context.exception))
+
 if __name__ == '__main__':
     unittest.main()
@@ -23,6 +23,11 @@ class PgsqlConfig:
         - PORT (str): Port on which PostgreSQL is running.
         - DATABASE (str): Name of the PostgreSQL database.
         - TABLE (str): Table containing parking information.
+        - POOL_SIZE (int): Number of connections kept open in the SQLAlchemy connection pool.
+        - MAX_OVERFLOW (int): Number of extra connections allowed above POOL_SIZE.
+        - POOL_RECYCLE (int): Lifetime in seconds after which a pooled connection is replaced.
+        - CONNECTION_RETRY_DELAY (int): Delay in milliseconds before retrying after a failed database connection.
+        - MAX_CONNECTION_RETRIES (int): Number of retries after which the script stops.
         
     IMPORTANT: Customize these values to match your environment and database setup.
     """    
@@ -32,6 +37,11 @@ class PgsqlConfig:
     PORT = "5432"
     DATABASE = "parking_lyon_db"
     TABLE =  "parking_table"
+    POOL_SIZE = 5
+    MAX_OVERFLOW = 5
+    POOL_RECYCLE = 1800
+    CONNECTION_RETRY_DELAY = 60000
+    MAX_CONNECTION_RETRIES = 5
 
 class DataHandlerConfig:
     """
@@ -40,11 +50,15 @@ class DataHandlerConfig:
     Constants:
         - REQUIRED_COLUMNS_SET (set[str]):  Required columns for data processing.
         - CIRCLE_SIZE_BOUNDS (tuple): Min and max bounds for circle sizes.
+        - HISTORY_DAYS (int): Number of days of history kept before the most recent record.
         - HOMEPAGE_PARKING_ID: parking ID related to the Figure objects to be displayed on the homepage layout.
         - DATA_TABLE_COLUMNS_FILTER (list[str]):  Columns to be shown in the DataTable view.
+        - SOURCE_HISTORY_COLUMNS (list[str]): Columns sent to the browser for the history plots and website link.
+        - SOURCE_MAP_COLUMNS (list[str]): Columns sent to the browser for the map.
     """
-    REQUIRED_COLUMNS_SET = {"parking_id", "nb_of_available_parking_spaces", "date"}
+    REQUIRED_COLUMNS_SET = {"parking_id", "nombre_de_places_disponibles", "date"}
     CIRCLE_SIZE_BOUNDS = (10, 25)
+    HISTORY_DAYS = 15
     HOMEPAGE_PARKING_ID = 'LPA0740'
     DATA_TABLE_COLUMNS_FILTER = [
         "parking",
@@ -57,6 +71,20 @@ class DataHandlerConfig:
         "tarifs",
         "adresse"
     ]
+    SOURCE_HISTORY_COLUMNS = [
+        "date",
+        "nombre_de_places_disponibles",
+        "parking",
+        "site_web"
+    ]
+    SOURCE_MAP_COLUMNS = [
+        "parking_id",
+        "parking",
+        "nombre_de_places_disponibles",
+        "capacité_total",
+        "lon_mercator",
+        "lat_mercator"
+    ]
 
 class BokehVisualizerConfig:
     """
@@ -67,8 +95,11 @@ class BokehVisualizerConfig:
         - LONGITUDE_LYON (float): Longitude in degrees.
         - ZOOM_LEVEL (float): Zoom level for the map view.
         - UPDATE_FREQUENCY (int): Frequency of layout updates in milliseconds.
+        - SELECTION_DEBOUNCE_DELAY (int): Delay in milliseconds without new map selection before the Python
+            selection callback runs.
     """
     LATITUDE_LYON = 45.764043
     LONGITUDE_LYON = 4.835659
     ZOOM_LEVEL = 10000
     UPDATE_FREQUENCY = 600000 #10 minutes
+    SELECTION_DEBOUNCE_DELAY = 150
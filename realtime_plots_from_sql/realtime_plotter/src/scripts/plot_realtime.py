@@ -17,20 +17,22 @@ Dependencies:
 Environment Variables:
 - Ensure PGPASSWORD is set to connect to the database.
 '''
-import ast
+import asyncio
+from bokeh.document import without_document_lock
 from bokeh.layouts import column, row
-from bokeh.models import CDSView, ColumnDataSource, CustomJS, DataTable, Div, DatetimeTickFormatter, HTMLTemplateFormatter
+from bokeh.models import CDSView, ColumnDataSource, DataTable, Div, DatetimeTickFormatter, HTMLTemplateFormatter
 from bokeh.models import HoverTool, IndexFilter, RadioButtonGroup, Range1d, TableColumn, TapTool
 from bokeh.plotting import curdoc, figure
 from bokeh.transform import linear_cmap
-import json
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 import logging
-import math
 import numpy as np
 import os
 import pandas as pd
 from config.config import BokehVisualizerConfig, DataHandlerConfig, PgsqlConfig 
-from sqlalchemy import create_engine
+import re
+from sqlalchemy import create_engine, text
 import time
 import xyzservices.providers as xyz
 
@@ -40,6 +42,13 @@ LOGS_FILEPATH = os.path.join(LOGS_OUTPUT_DIR, LOGS_FILENAME)
 LOG_FORMAT = "%(levelname)s %(asctime)s - %(message)s" 
 
 GENERAL_INFO_CSV_FILEPATH = "./data/parking_general_information.csv"
+# Part of the cache file name: bump it whenever prepare_general_info_dataframe changes the cached frame
+GENERAL_INFO_CACHE_VERSION = 3
+CAPACITY_PATTERN = re.compile(r"""['"]?mv:maximumValue['"]?\s*:\s*(\d+)""")
+ADDRESS_PATTERNS = [
+    re.compile(r"""['"]%s['"]?\s*:\s*['"]?(.*?)['"]?\s*(?:,\s*['"]schema:|\})""" % re.escape(address_key))
+    for address_key in ["schema:streetAddress", "schema:postalCode", "schema:addressLocality"]
+]
 
 os.makedirs(LOGS_OUTPUT_DIR, exist_ok=True)
 
@@ -63,18 +72,33 @@ class DataHandler:
 
     Attributes:
         - csv_filepath(str): Path to the CSV file with parking information.
+        - cache_filepath(str): Path to the pickle file caching the preprocessed CSV data,
+            tagged with "GENERAL_INFO_CACHE_VERSION".
         - pqsql_config (PgsqlConfig): PostgreSQL connection configuration
             (attributes: 'user', 'password', 'host', 'port', 'database', 'table').
+        - pgsql_url (str): PostgreSQL connection URL built once from "pgsql_config".
+        - engine (Engine): SQLAlchemy engine created on the first fetch and reused, with its connection pool,
+            by every periodic update.
+        - history_query (TextClause): Query fetching the last "history_days" days of records.
+        - update_query (TextClause): Query fetching the records newer than a given date.
         - required_columns_set (set[str]): Set of required column names expected in "realtime_dataframe".
         - circle_size_bounds (tuple): Min and max bounds for circle sizes.
+        - history_days (int): Number of days of history kept before the most recent record.
         - current_parking_id (str): parking ID related to the Figure objects to be displayed on the layout.
         - data_table_columns_filter (list[str]):  Columns to be shown in the DataTable view.
+        - source_history_columns (list[str]): Columns of "source_history".
+        - source_map_columns (list[str]): Columns of "source_map", besides the circle sizes.
         - df_general_info (pd.DataFrame): DataFrame containing general parking information.
-        - df_global (DataFrame): Merged DataFrame with parking real-time and general info.
-        - source_original (ColumnDataSource): Full original dataset for visualizations.
+        - df_global (DataFrame): Merged DataFrame with parking real-time records fetched so far, limited to
+            the last "history_days" days, and general info.
+        - df_map (DataFrame): Most recent record of each parking in "df_global", sorted by parking ID.
+        - parking_id_dtype (pd.CategoricalDtype): Category dtype shared by "parking_id" and "identifier" columns.
+        - general_info_by_code (pd.DataFrame): "df_general_info" rows ordered by "parking_id_dtype" category codes.
         - source_history (ColumnDataSource): Filtered dataset for historical availability visualizations.
         - source_map (ColumnDataSource): Filtered dataset for map-based parking visualization..
         - source_table (ColumnDataSource): Dataset displayed in the parking details table view.
+        - last_update_date (pd.Timestamp): Most recent date of "df_global" already pushed to the sources.
+        - history_parking_id (str): parking ID whose history is currently held in "source_history".
     """
 
     def __init__(self, csv_filepath, pgsql_config, handler_config):
@@ -86,41 +110,67 @@ class DataHandler:
         - handler_config(DataHandlerConfig) : Configuration parameters for class DataHandler containing:
             - REQUIRED_COLUMNS_SET (set[str]):  Required columns for data processing.
             - CIRCLE_SIZE_BOUNDS (tuple): Min and max bounds for circle sizes.
+            - HISTORY_DAYS (int): Number of days of history kept before the most recent record.
             - HOMEPAGE_PARKING_ID: parking ID related to the Figure objects to be displayed on the homepage layout.
             - DATA_TABLE_COLUMNS_FILTER (list[str]):  Columns to be shown in the DataTable view.
+            - SOURCE_HISTORY_COLUMNS (list[str]): Columns sent to the browser for the history plots and website link.
+            - SOURCE_MAP_COLUMNS (list[str]): Columns sent to the browser for the map.
         """
         self.csv_filepath = csv_filepath
+        self.cache_filepath = f"{csv_filepath}.v{GENERAL_INFO_CACHE_VERSION}.cache.pkl"
         self.pgsql_config = pgsql_config
+        self.pgsql_url = (
+            f"postgresql://{pgsql_config.USER}:{pgsql_config.PASSWORD}"
+            f"@{pgsql_config.HOST}:{pgsql_config.PORT}/{pgsql_config.DATABASE}"
+        )
+        self.engine = None
+        self.history_days = handler_config.HISTORY_DAYS
+        # Queries are built once, so each periodic update reuses the same statement and its compiled form
+        # from the SQLAlchemy statement cache. Available spaces are renamed here so no pandas rename is needed.
+        select_clause = f"""
+            SELECT parking_id, nb_of_available_parking_spaces AS nombre_de_places_disponibles, date
+            FROM {pgsql_config.TABLE}
+            """
+        # Fetch only data from the last two weeks to prevent EC2 instance crash
+        self.history_query = text(
+            f"{select_clause} WHERE date >= (SELECT MAX(date) FROM {pgsql_config.TABLE}) "
+            f"- INTERVAL '{self.history_days} days';"
+            )
+        self.update_query = text(f"{select_clause} WHERE date > :since;")
         self.required_columns_set = handler_config.REQUIRED_COLUMNS_SET
         self.circle_size_bounds = handler_config.CIRCLE_SIZE_BOUNDS
         self.current_parking_id = handler_config.HOMEPAGE_PARKING_ID
         self.data_table_columns_filter = handler_config.DATA_TABLE_COLUMNS_FILTER
+        self.source_history_columns = handler_config.SOURCE_HISTORY_COLUMNS
+        self.source_map_columns = handler_config.SOURCE_MAP_COLUMNS
         self.df_general_info = pd.DataFrame()
         self.df_global = pd.DataFrame()
-        self.source_original = ColumnDataSource()
+        self.df_map = pd.DataFrame()
+        self.parking_id_dtype = None
+        self.general_info_by_code = pd.DataFrame()
         self.source_history = ColumnDataSource()
         self.source_map = ColumnDataSource()
         self.source_table = ColumnDataSource()
+        self.last_update_date = None
+        self.history_parking_id = None
 
     @staticmethod
-    def get_address(string_dict):
+    def get_address(address_series):
         """
-        Extract an address from a string representing a dictionary.
+        Extract addresses from a Series of strings representing dictionaries.
+
+        Each field is extracted over the whole Series with its precompiled pattern from "ADDRESS_PATTERNS",
+        a value ending where the next 'schema:' key or the closing brace starts.
 
         Parameters:
-        - string_dict (str): A string containing address information.
+        - address_series (pd.Series): Strings containing address information.
 
         Returns:
-        - str: A formatted address string (street, postal code, locality).
+        - pd.Series: Formatted address strings (street, postal code, locality).
         """
-        address_keys = ["schema:streetAddress", "schema:postalCode", "schema:addressLocality"]
-        string_dict = string_dict.strip('"').replace('"', "'")
-        string_dict = string_dict.replace("': ", '": "').replace(", '", '", "').replace("'\"", '"' ).replace("\"'", '"' ).replace("{'", '{"').replace("'}", '"}')
-        address_dict = ast.literal_eval(string_dict)
-        address = [str(address_dict.get(key)) for key in address_keys]
-        adress_string = " ".join(address)
+        address_fields = [address_series.str.extract(pattern, expand=False) for pattern in ADDRESS_PATTERNS]
 
-        return adress_string
+        return address_fields[0] + " " + address_fields[1] + " " + address_fields[2]
     
     @staticmethod
     def get_parking_capacity(capacity_str):
@@ -128,40 +178,39 @@ class DataHandler:
         Parse and retrieve the 'mv:maximumValue' from a string representing a list of dictionaries.
 
         The input string contains data in a JSON-like format, and this function extracts the 
-        'mv:maximumValue' from the last dictionary in the list.
+        'mv:maximumValue' from the last dictionary in the list. The value is matched with
+        "CAPACITY_PATTERN" from the last opening brace, without parsing the whole list.
 
         Parameters:
         - capacity_str (str): A string representation of a list of dictionaries.
 
         Returns:
         - int or "not reported": The value of the 'mv:maximumValue' key, or "not reported" if the key is not present.
-        
-        Raises:
-        - ValueError: If the input string cannot be evaluated as a valid list of dictionaries.
         """
-        str_clean = capacity_str.replace("'", '"')
-        str_clean = str_clean.replace(": ,", ': "not reported",')
-        data_list = json.loads(str_clean)
-        last_dict = data_list[-1]
+        match = CAPACITY_PATTERN.search(capacity_str, capacity_str.rfind("{"))
 
-        return last_dict.get("mv:maximumValue")
+        return int(match.group(1)) if match else "not reported"
 
     @staticmethod
-    def clean_phone_number(phone_number):
+    def clean_phone_number(phone_series):
         """
-        Format a phone number by ensuring it starts with '0' and adding spaces every 2 digits.
+        Format phone numbers by ensuring they start with '0' and adding spaces every 2 digits.
+
+        The formatting is done with vectorized string operations over the whole Series.
 
         Parameters:
-        - phone_number (int or str): The input phone number.
+        - phone_series (pd.Series): The input phone numbers, missing values as NaN.
 
         Returns:
-        - str: A formatted phone number (e.g., "01 23 45 67 89").
+        - pd.Series: Formatted phone numbers (e.g., "01 23 45 67 89"), missing values kept as NaN.
         """
-        if not pd.isna(phone_number): 
-            phone_number = "0" + str(int(phone_number))
-            phone_number_slices_list = [phone_number[i: i+2] for i in range(0, 10, 2)]
-            phone_number = " ".join(phone_number_slices_list)
-        return phone_number
+        phone_numbers = "0" + phone_series.astype("Int64").astype(str)
+        formatted_phone_numbers = (
+            phone_numbers.str[0:2] + " " + phone_numbers.str[2:4] + " " + phone_numbers.str[4:6]
+            + " " + phone_numbers.str[6:8] + " " + phone_numbers.str[8:10]
+        )
+
+        return formatted_phone_numbers.where(phone_series.notna())
             
     def prepare_general_info_dataframe(self):
         """
@@ -169,63 +218,110 @@ class DataHandler:
 
         Reads the file at `csv_filepath`, cleans and formats the data, 
         including address, phone number, capacity, coordinates (in lat/lon and Web Mercator), 
-        and fills missing values. Renames columns for clarity.
+        and fills missing values. Renames columns for clarity and keeps only the columns
+        merged into the real-time data.
+
+        The result is cached to `cache_filepath` and reloaded from it as long as the cache
+        is not older than the CSV file. Caches written by an older version of this method
+        have another file name, so they are never reloaded.
 
         Updates Attributs:
         - df_general_info (pd.DataFrame): A cleaned DataFrame with standardized columns for further processing.
         """
-        df_general_info = pd.read_csv(self.csv_filepath, sep=";")
-        df_general_info['adresse'] = df_general_info['address'].apply(DataHandler.get_address)
-        df_general_info['capacité_total'] = df_general_info['capacity'].apply(DataHandler.get_parking_capacity)
-        df_general_info['téléphone'] = df_general_info['telephone'].apply(DataHandler.clean_phone_number)
-        df_general_info['lat'] = df_general_info['lat'].astype(str).str.replace(',', '.').astype(float)
-        df_general_info['lon'] = df_general_info['lon'].astype(str).str.replace(',', '.').astype(float)
-        df_general_info[["lon_mercator", "lat_mercator"]] = df_general_info.apply(
-            lambda row: pd.Series(latlon_to_webmercator(row["lat"], row["lon"])),
-            axis=1
+        if (os.path.exists(self.cache_filepath)
+                and os.path.getmtime(self.cache_filepath) >= os.path.getmtime(self.csv_filepath)):
+            self.df_general_info = pd.read_pickle(self.cache_filepath)
+            return
+
+        # Coordinates use a comma as decimal separator; height limits are kept as displayed strings.
+        # Only the columns used below are parsed, out of the 24 columns of the file.
+        df_general_info = pd.read_csv(
+            self.csv_filepath,
+            sep=";",
+            decimal=",",
+            usecols=['identifier', 'name', 'url', 'address', 'numberoflevels', 'vehicleheightlimitinm',
+                     'telephone', 'capacity', 'resumetarifshoraires', 'lon', 'lat'],
+            dtype={"vehicleheightlimitinm": str}
         )
+        df_general_info['adresse'] = DataHandler.get_address(df_general_info['address'])
+        df_general_info['capacité_total'] = df_general_info['capacity'].map(DataHandler.get_parking_capacity)
+        df_general_info['téléphone'] = DataHandler.clean_phone_number(df_general_info['telephone'])
+        df_general_info["lon_mercator"], df_general_info["lat_mercator"] = latlon_to_webmercator(
+            df_general_info["lat"].to_numpy(),
+            df_general_info["lon"].to_numpy()
+        )
+        # float32 keeps Web Mercator coordinates to well under a metre, with half the bytes sent to the browser
+        df_general_info[["lon_mercator", "lat_mercator"]] = df_general_info[["lon_mercator", "lat_mercator"]].astype(np.float32)
+        # Text columns merged into the real-time data use the pandas string dtype, missing values as pd.NA
+        text_columns = ["name", "url", "adresse", "téléphone", "vehicleheightlimitinm", "resumetarifshoraires"]
+        df_general_info[text_columns] = df_general_info[text_columns].astype("string")
         df_general_info["resumetarifshoraires"] = df_general_info["resumetarifshoraires"].fillna(" ")
-        df_general_info.rename(
+
+        # Rename and project once at startup so the periodic merge works on final column names
+        df_general_info = df_general_info.rename(
             columns={
                 "name": "parking",
                 "url": "site_web",
                 "numberoflevels": "nombre de niveaux",
                 "vehicleheightlimitinm": "hauteur limite (mètre)",
                 "resumetarifshoraires": "tarifs",
-                },
-            inplace=True
-        )
-        
+                }
+        )[['identifier',
+           'parking',
+           'site_web',
+           'adresse',
+           'nombre de niveaux',
+           'hauteur limite (mètre)',
+           'téléphone',
+           'tarifs',
+           'lon_mercator',
+           'lat_mercator',
+           'capacité_total']]
+
+        try:
+            df_general_info.to_pickle(self.cache_filepath)
+        except OSError:
+            logger.warning("Could not write the general information cache file.", exc_info=True)
+
         self.df_general_info = df_general_info
 
-    def get_realtime_dataframe(self):
+    def get_realtime_dataframe(self, since=None):
         """
         Fetches a real-time dataframe from a PostgreSQL database table.
 
+        Without "since", fetches the last "history_days" days of records. With "since", fetches only
+        the records strictly newer than this date, which may be an empty DataFrame.
+
+        The SQLAlchemy engine is created on the first call only; later calls reuse its pooled connections
+        and the prebuilt "history_query" and "update_query" statements.
+
+        Parameters:
+        - since (pd.Timestamp, optional): Date of the most recent record already fetched.
+
         Raises:
         - DatabaseConnectionError: If there is an issue connecting to the database or fetching data.
 
         Returns:
         - pd.DataFrame: A DataFrame containing the data from the specified table.
         """
-        password = self.pgsql_config.PASSWORD
-        user = self.pgsql_config.USER
-        host = self.pgsql_config.HOST
-        port = self.pgsql_config.PORT
-        database = self.pgsql_config.DATABASE
         table = self.pgsql_config.TABLE
+
+        if since is None:
+            query, params = self.history_query, None
+        else:
+            query, params = self.update_query, {"since": since}
   
         try:
-            engine = create_engine(
-                f"postgresql://{user}:{password}@{host}:{port}/{database}")
-            
-            # SQL query to fetch only data from the last two weeks to prevent EC2 instance crash
-            query = f"""
-                SELECT * 
-                FROM parking_table
-                WHERE date >= (SELECT MAX(date) FROM parking_table) - INTERVAL '15 days';
-                """
-            df_realtime = pd.read_sql_query(query, engine)
+            if self.engine is None:
+                self.engine = create_engine(
+                    self.pgsql_url,
+                    pool_size=self.pgsql_config.POOL_SIZE,
+                    max_overflow=self.pgsql_config.MAX_OVERFLOW,
+                    pool_pre_ping=True,
+                    pool_recycle=self.pgsql_config.POOL_RECYCLE
+                )
+
+            df_realtime = pd.read_sql_query(query, self.engine, params=params)
         except:
             error_msg = "Error attemting to fetch data from PostgreSQL"
             logger.error(error_msg, exc_info=True)
@@ -236,13 +332,24 @@ class DataHandler:
             logger.error(error_msg, exc_info=True)
             raise DatabaseOperationError(error_msg)
 
-        if df_realtime.empty:
+        if df_realtime.empty and since is None:
             error_msg = f"Error: Query executed successfully, but the table '{table}' is empty."
             logger.error(error_msg, exc_info=True)
             raise DatabaseOperationError(error_msg)
 
         return df_realtime
 
+    def dispose_engine(self):
+        """
+        Closes the pooled PostgreSQL connections of the SQLAlchemy engine, if it has been created.
+
+        Updates Attributes:
+        - engine (Engine): Reset to None.
+        """
+        if self.engine is not None:
+            self.engine.dispose()
+            self.engine = None
+
     def validate_realtime_df_columns(self, df_realtime):
         """
         Validates that the DataFrame contains the required columns.
@@ -253,62 +360,90 @@ class DataHandler:
         Raises:
         - ValueError: If the DataFrame does not contain all required columns.
         """
-        required_columns_set = self.required_columns_set
+        missing_columns = self.required_columns_set - set(df_realtime.columns)
 
-        if not required_columns_set.issubset(df_realtime.columns):
-            missing_columns = required_columns_set - set(df_realtime.columns)
+        if missing_columns:
             error_msg = f"""
             DataFrame fetched from PostgreSQL database does not contain expected columns.\n
             Missing columns: {missing_columns}"""
             logger.error(error_msg)
             raise ValueError(error_msg)
 
-    def prepare_global_dataframe(self, df_realtime):
+    def categorize_parking_id(self, df_realtime):
+        """
+        Converts the "parking_id" column of real-time records to the shared category dtype.
+
+        Categories are the parking identifiers of "df_general_info", extended with any unknown parking ID,
+        so that merges and comparisons work on category codes instead of strings. Whenever categories change,
+        a new general information lookup table is built with one row per category code, its "identifier"
+        column converted to the same dtype.
+
+        No attribute is modified, so this method can run outside of the Bokeh document thread:
+        the returned dtype and lookup table are stored by "update_sources".
+
+        Parameters:
+        - df_realtime (pd.DataFrame): Real-time records with a "parking_id" column.
+
+        Returns:
+        - tuple:
+            - pd.DataFrame: "df_realtime" with a categorical "parking_id" column.
+            - pd.CategoricalDtype: Category dtype shared by "parking_id" and "identifier" columns.
+            - pd.DataFrame: "df_general_info" rows ordered by the category codes of that dtype.
+        """
+        parking_id_dtype = self.parking_id_dtype
+        general_info_by_code = self.general_info_by_code
+
+        if parking_id_dtype is None:
+            categories = pd.Index(self.df_general_info['identifier'].unique())
+        else:
+            categories = parking_id_dtype.categories
+
+        unknown_parking_ids = pd.Index(df_realtime['parking_id'].unique()).difference(categories)
+
+        if parking_id_dtype is None or not unknown_parking_ids.empty:
+            parking_id_dtype = pd.CategoricalDtype(categories.union(unknown_parking_ids).sort_values())
+            general_info_by_code = (
+                self.df_general_info.astype({'identifier': parking_id_dtype})
+                .drop_duplicates('identifier')
+                .set_index('identifier', drop=False)
+                .reindex(parking_id_dtype.categories)
+                .reset_index(drop=True)
+            )
+
+        return df_realtime.astype({'parking_id': parking_id_dtype}), parking_id_dtype, general_info_by_code
+
+    def prepare_global_dataframe(self, df_realtime, general_info_by_code):
         """
         Merges general parking information with real-time data.
 
         Combines data from "self.df_general_info" and "df_realtime" into a single DataFrame, 
         enriching real-time data with additional details like parking address, capacity, 
-        and coordinates. Formats columns, renames for clarity, and sorts by date.
+        and coordinates. Formats columns, stores available spaces as int16 and sorts by date.
+
+        General information rows are looked up by the category codes of "parking_id" in
+        "general_info_by_code", instead of a hash join on parking IDs.
 
         Parameters:
-        - df_realtime (pd.DataFrame): DataFrame containing real-time parking data.
+        - df_realtime (pd.DataFrame): DataFrame containing real-time parking data, with a "parking_id"
+            column converted by "categorize_parking_id".
+        - general_info_by_code (pd.DataFrame): General information lookup table returned by
+            "categorize_parking_id" with "df_realtime".
 
-        Update Attributs and Returns:
+        Returns:
         - df_global (pd.DataFrame): A merged and formatted DataFrame for further analysis or visualization.
         """
-        df_general_info = self.df_general_info
-
-        df_global = pd.merge(
-            left=df_realtime,
-            right=df_general_info[['identifier',
-                                'parking',
-                                'site_web',
-                                'adresse',
-                                'nombre de niveaux',
-                                'hauteur limite (mètre)',
-                                'téléphone',
-                                'tarifs',	
-                                'lon_mercator',
-                                'lat_mercator',   
-                                'capacité_total']],
-            how='left', left_on='parking_id',
-            right_on='identifier'
-            )
-        
-        df_global['heure'] = df_global['date'].apply(lambda x: x.strftime('%d %B %Y %H:%M:%S'))
-        df_global.rename(
-        columns={
-            "nb_of_available_parking_spaces": "nombre_de_places_disponibles",
-            },
-        inplace=True
-        )
+        # Missing parking IDs have the code -1, which is not a row label and gets NaN general information
+        parking_id_codes = df_realtime['parking_id'].cat.codes.to_numpy()
+        df_general_info = general_info_by_code.reindex(parking_id_codes).reset_index(drop=True)
+        df_global = pd.concat([df_realtime.reset_index(drop=True), df_general_info], axis=1)
+
+        df_global['heure'] = df_global['date'].dt.strftime('%d %B %Y %H:%M:%S')
         df_global.dropna(subset=['date', 'nombre_de_places_disponibles'], inplace=True)
+        # Available spaces fit in 16 bits, which halves the history buffers sent to the browser
+        df_global['nombre_de_places_disponibles'] = df_global['nombre_de_places_disponibles'].astype(np.int16)
         df_global.sort_values('date', inplace=True)
 
-        self.df_global = df_global
-
-        return self.df_global
+        return df_global
     
     @staticmethod
     def normalize_number(nb, data_range, expected_range):
@@ -316,14 +451,16 @@ class DataHandler:
         Normalize a number to fit within a target range while preserving its relative position.
 
         Maps the input number ("nb") from the original range ("data_range") to a new range ("expected_range).
+        "nb" can also be a NumPy array, in which case every element is normalized at once.
 
         Parameters:
-        - nb (float): The number to normalize.
+        - nb (float or np.ndarray): The number to normalize.
         - data_range (tuple of float): The original range (min, max).
         - expected_range (tuple of float): The target range (min, max).
 
         Returns:
-        - float: The normalized number within the "expected_range".
+        - float or np.ndarray: The normalized number within the "expected_range". The middle of
+            "expected_range" is returned as a float when "data_range" is empty.
         """
         result =  (expected_range[0] + expected_range[1]) / 2
 
@@ -332,6 +469,50 @@ class DataHandler:
 
         return result
     
+    @staticmethod
+    def to_source_data(df):
+        """
+        Convert a DataFrame into ColumnDataSource data made of one NumPy array per column.
+
+        NumPy arrays avoid building a Python list per column and let Bokeh send numeric
+        and datetime columns as binary buffers. Missing values of string columns are converted
+        from pd.NA to None, since Bokeh compares cell values when sources are patched and
+        pd.NA has no truth value.
+
+        Parameters:
+        - df (pd.DataFrame): The DataFrame to convert.
+
+        Returns:
+        - dict[str, np.ndarray]: Column names mapped to their values.
+        """
+        return {
+            column: df[column].to_numpy(dtype=object, na_value=None)
+            if isinstance(df[column].dtype, pd.StringDtype) else df[column].to_numpy()
+            for column in df.columns
+        }
+
+    def get_circle_sizes(self, available_spaces):
+        """
+        Computes circle sizes by normalizing available spaces within "circle_size_bounds".
+
+        The normalization runs once over the whole column as a NumPy array, and sizes are returned as float32
+        since circle sizes in screen units need no double precision.
+
+        Parameters:
+        - available_spaces (array-like): Number of available spaces of each parking.
+
+        Returns:
+        - np.ndarray: The circle size (float32) of each parking.
+        """
+        available_spaces = np.asarray(available_spaces, dtype=np.float64)
+        available_spaces_range = (available_spaces.min(), available_spaces.max())
+
+        return np.full(
+            available_spaces.shape,
+            DataHandler.normalize_number(available_spaces, available_spaces_range, self.circle_size_bounds),
+            dtype=np.float32
+            )
+
     def add_circle_size_to_source_map(self):
         """
         Adds normalized circle sizes to the "source_map" attribute based on available spaces.
@@ -344,56 +525,202 @@ class DataHandler:
         - source_map (ColumnDataSource): Contains the map visualization data for parking availability.
         """
         source_map = self.source_map
+        source_map.data['normalized_circle_size'] = self.get_circle_sizes(source_map.data["nombre_de_places_disponibles"])
 
-        available_spaces_range = (
-            min(source_map.data["nombre_de_places_disponibles"]),
-            max(source_map.data["nombre_de_places_disponibles"])
-            )
-        normalized_circle_sizes = [DataHandler.normalize_number(x, available_spaces_range, self.circle_size_bounds)
-                            for x in source_map.data["nombre_de_places_disponibles"]]
-        source_map.data['normalized_circle_size'] = normalized_circle_sizes
+    def patch_source_map(self, df_map):
+        """
+        Patches the "source_map" attribute with the cells that changed since the previous update.
 
+        For a given parking, only the columns coming from the real-time records and the circle
+        size can change, so the general information columns are not compared.
+        "df_map" must hold the same parkings in the same order as "source_map".
 
-    def update_sources(self):
-            """
-            Updates Bokeh ColumnDataSource objects with the latest parking data and current selected parking ID.
+        Parameters:
+        - df_map (pd.DataFrame): Most recent record of each parking, merged with general information.
 
-            Fetches real-time and general parking data, prepares a global DataFrame, 
-            merges relevant information, and updates sources for the map, step plot, and table.
+        Updates Attributes:
+        - source_map (ColumnDataSource): Contains the map visualization data for parking availability.
+        """
+        realtime_columns = [column for column in df_map.columns if column not in self.df_general_info.columns]
+        new_data = DataHandler.to_source_data(df_map[realtime_columns])
+        new_data['normalized_circle_size'] = self.get_circle_sizes(new_data["nombre_de_places_disponibles"])
 
-            Updates Attributes:
-            - df_global (DataFrame): Global DataFrame with parking general information and history occupancy.
-            - source_original (ColumnDataSource): Full original dataset for visualizations.
-            - source_history (ColumnDataSource): original dataset filtered for parking availability history visualisation.
-            - source_map (ColumnDataSource): original dataset filtered for map visualization.
-            - source_table (ColumnDataSource): Table data for displaying parking details.
-            """
-            current_parking_id = self.current_parking_id
-            data_table_columns_filter = self.data_table_columns_filter
+        patches = {}
+        for column, new_values in new_data.items():
+            changed_indices = np.flatnonzero(np.asarray(self.source_map.data[column]) != new_values)
+            if changed_indices.size:
+                patches[column] = [(int(index), new_values[index]) for index in changed_indices]
+
+        if patches:
+            self.source_map.patch(patches)
+
+    def patch_source_table(self, transposed_data):
+        """
+        Patches the "Value" cells of the "source_table" attribute that changed since the previous update.
+
+        "source_table" is fully replaced instead when its fields differ from those of "transposed_data".
+
+        Parameters:
+        - transposed_data (dict): Table data with "Field" and "Value" lists.
+
+        Updates Attributes:
+        - source_table (ColumnDataSource): Table data for displaying parking details.
+        """
+        if list(self.source_table.data.get('Field', [])) != list(transposed_data['Field']):
+            self.source_table.data = transposed_data
+            return
+
+        value_patches = []
+        for index, (old_value, new_value) in enumerate(zip(self.source_table.data['Value'], transposed_data['Value'])):
+            # Missing values are checked first, since comparing pd.NA with "!=" has no truth value
+            old_missing, new_missing = pd.isna(old_value), pd.isna(new_value)
+            if old_missing and new_missing:
+                continue
+            if old_missing or new_missing or old_value != new_value:
+                value_patches.append((index, new_value))
+
+        if value_patches:
+            self.source_table.patch({'Value': value_patches})
+
+    def get_global_dataframe(self):
+        """
+        Fetches the latest real-time records and merges them with general parking information.
 
+        On the first call, the last "history_days" days of records are fetched from PostgreSQL. Afterwards,
+        only records newer than those already in "df_global" are fetched. Only these new records are merged
+        with general information and appended to a copy of "df_global", then records older than
+        "history_days" days before the most recent one are dropped.
+
+        No attribute nor Bokeh object is modified, so this method can run outside of the Bokeh document
+        thread. The parking ID categorization it may extend is returned along with the DataFrame, and
+        stored by "update_sources" on the document thread.
+
+        Returns:
+        - tuple: Arguments to be passed to "update_sources":
+            - pd.DataFrame: The updated global DataFrame.
+            - pd.CategoricalDtype: Category dtype shared by "parking_id" and "identifier" columns.
+            - pd.DataFrame: "df_general_info" rows ordered by the category codes of that dtype.
+        """
+        if self.df_global.empty:
             df_realtime = self.get_realtime_dataframe()
             self.validate_realtime_df_columns(df_realtime)
+            df_realtime, parking_id_dtype, general_info_by_code = self.categorize_parking_id(df_realtime)
+            return self.prepare_global_dataframe(df_realtime, general_info_by_code), parking_id_dtype, general_info_by_code
+
+        df_new_records = self.get_realtime_dataframe(since=self.df_global['date'].max())
+        self.validate_realtime_df_columns(df_new_records)
+        df_global = self.df_global
+        parking_id_dtype = self.parking_id_dtype
+        general_info_by_code = self.general_info_by_code
+
+        if not df_new_records.empty:
+            df_new_records, parking_id_dtype, general_info_by_code = self.categorize_parking_id(df_new_records)
+            # New records are more recent than every row of df_global, so the concatenation stays sorted.
+            # Both frames must share the same categories, otherwise concat falls back to object dtype.
+            df_global = df_global.astype({'parking_id': parking_id_dtype, 'identifier': parking_id_dtype})
+            df_global = pd.concat(
+                [df_global, self.prepare_global_dataframe(df_new_records, general_info_by_code)],
+                ignore_index=True
+                )
+            window_start = df_global['date'].max() - pd.Timedelta(days=self.history_days)
+            df_global = df_global[df_global['date'] >= window_start]
+
+        return df_global, parking_id_dtype, general_info_by_code
+
+    def update_history_sources(self):
+        """
+        Updates "source_history" and "source_table" with the records of the selected parking held in "df_global".
 
-            df_global = self.prepare_global_dataframe(df_realtime)
-            
-            df_history_plot = df_global[df_global['parking_id']==self.current_parking_id]
+        The full history of every parking stays on the server, only the history of the selected parking is sent
+        to the browser. "source_history" is fully replaced when the selected parking has changed, otherwise only
+        rows newer than "last_update_date" are streamed, with a rollover dropping the rows that left the fetched
+        time window. Only the changed cells of "source_table" are patched.
+
+        Updates Attributes:
+        - source_history (ColumnDataSource): "df_global" filtered for parking availability history visualisation.
+        - source_table (ColumnDataSource): Table data for displaying parking details.
+        - history_parking_id (str): parking ID whose history is held in "source_history".
+        """
+        current_parking_id = self.current_parking_id
+        data_table_columns_filter = self.data_table_columns_filter
+
+        df_history = self.df_global[self.df_global['parking_id']==current_parking_id]
+        df_history_plot = df_history[self.source_history_columns]
+
+        if self.last_update_date is None or current_parking_id != self.history_parking_id:
+            self.source_history.data = DataHandler.to_source_data(df_history_plot)
+        else:
+            df_new_history = df_history_plot[df_history_plot['date'] > self.last_update_date]
+            if not df_new_history.empty:
+                self.source_history.stream(DataHandler.to_source_data(df_new_history), rollover=len(df_history_plot))
+
+        # df_global is sorted by date, so the last row of the parking is its most recent record
+        transposed_data = {
+            "Field": data_table_columns_filter,
+            "Value": df_history[data_table_columns_filter].iloc[-1].tolist()
+        }
+        self.patch_source_table(transposed_data)
+        self.history_parking_id = current_parking_id
+
+    def update_sources(self, df_global=None, parking_id_dtype=None, general_info_by_code=None):
+            """
+            Updates Bokeh ColumnDataSource objects with the latest parking data and current selected parking ID.
+
+            Uses "df_global" and the parking ID categorization prepared by "get_global_dataframe",
+            or calls it when not provided, and updates sources for the map, step plot, and table.
 
-            df_more_recent_value = df_global.groupby('parking_id').agg({'date': 'max'})
-            df_map = df_global.merge(df_more_recent_value , on=['parking_id', 'date'])
-            df_map["normalized_circle_size"] = self.circle_size_bounds[0]
-            df_table = df_map[df_map['parking_id']==current_parking_id]
+            "source_map" rows are sorted by parking ID and only the changed cells of "source_map"
+            are patched, unless the set of parkings has changed. After the first call, the most recent
+            record of each parking is updated from "df_map" and the new rows only, instead of the whole
+            history. "source_history" and "source_table" are updated by "update_history_sources".
+            Sources only hold "source_history_columns" and "source_map_columns".
+            No source is modified when no new record was fetched and the selected parking is unchanged.
 
-            transposed_data = {
-                "Field": data_table_columns_filter,
-                "Value": [df_table.iloc[0][col] for col in data_table_columns_filter]
-            }
+            Parameters:
+            - df_global (pd.DataFrame, optional): Global DataFrame returned by "get_global_dataframe".
+            - parking_id_dtype (pd.CategoricalDtype, optional): Category dtype returned by "get_global_dataframe".
+            - general_info_by_code (pd.DataFrame, optional): Lookup table returned by "get_global_dataframe".
+
+            Updates Attributes:
+            - df_global (DataFrame): Global DataFrame with parking general information and history occupancy.
+            - parking_id_dtype (pd.CategoricalDtype): Category dtype shared by "parking_id" and "identifier" columns.
+            - general_info_by_code (pd.DataFrame): "df_general_info" rows ordered by "parking_id_dtype" category codes.
+            - df_map (DataFrame): Most recent record of each parking in "df_global", sorted by parking ID.
+            - source_history (ColumnDataSource): "df_global" filtered for parking availability history visualisation.
+            - source_map (ColumnDataSource): "df_global" filtered for map visualization.
+            - source_table (ColumnDataSource): Table data for displaying parking details.
+            - last_update_date (pd.Timestamp): Most recent date of "df_global" pushed to the sources.
+            - history_parking_id (str): parking ID whose history is held in "source_history".
+            """
+            if df_global is None:
+                df_global, parking_id_dtype, general_info_by_code = self.get_global_dataframe()
+            self.parking_id_dtype = parking_id_dtype
+            self.general_info_by_code = general_info_by_code
+
+            # Nothing changed since the previous call, so no update is sent to the browser
+            if df_global is self.df_global and self.current_parking_id == self.history_parking_id:
+                return
+
+            # df_global is sorted by date, so the last row of each parking is its most recent record.
+            # After the first update, only the rows added since "last_update_date" can change it.
+            if self.last_update_date is None or self.df_map['parking_id'].dtype != df_global['parking_id'].dtype:
+                df_map = df_global.drop_duplicates('parking_id', keep='last')
+            else:
+                df_new_rows = df_global.iloc[df_global['date'].searchsorted(self.last_update_date, side='right'):]
+                df_map = pd.concat([self.df_map, df_new_rows]).drop_duplicates('parking_id', keep='last')
+                # Parkings whose most recent record left the time window are no longer in df_global
+                df_map = df_map[df_map['date'] >= df_global['date'].iloc[0]]
+            self.df_map = df_map.sort_values('parking_id', ignore_index=True)
+            df_map = self.df_map[self.source_map_columns]
 
             self.df_global = df_global
-            self.source_original.data = df_global.to_dict('list')
-            self.source_map.data = df_map.to_dict('list')
-            self.add_circle_size_to_source_map()
-            self.source_history.data = df_history_plot.to_dict('list')
-            self.source_table.data = transposed_data
+            self.update_history_sources()
+            if np.array_equal(self.source_map.data.get('parking_id', []), df_map['parking_id'].to_numpy()):
+                self.patch_source_map(df_map)
+            else:
+                self.source_map.data = DataHandler.to_source_data(df_map)
+                self.add_circle_size_to_source_map()
+            self.last_update_date = df_global['date'].max()
 
 class BokehVisualizer:
     """
@@ -417,8 +744,11 @@ class BokehVisualizer:
         - data_table (DataTable): A Bokeh data table displaying parking details.
         - data_table_url (DataTable): A Bokeh data table displaying parking website links.
         - switch_plot_button (RadioButtonGroup): button linked to the switch_plot method.
-        - selection_callback (CustomJS): The JavaScript callback.
+        - axis_range_dates (np.ndarray): "source_history" dates the cached axis bounds were computed from.
+        - axis_range_bounds (tuple): Cached x start, x end, y start and y end of the history plots.
         - update_frequency (int): Frequency of layout updates in milliseconds.
+        - selection_debounce_delay (int): Delay in milliseconds without new map selection before
+            "get_current_parking_id" runs.
         - bokeh_layout (Layout): Main Bokeh layout containing all visual elements.
     """
 
@@ -434,6 +764,8 @@ class BokehVisualizer:
             - LONGITUDE_LYON (float): Longitude in degrees.
             - ZOOM_LEVEL (float): Zoom level for the map view.
             - UPDATE_FREQUENCY (int): Frequency of layout updates in milliseconds.
+            - SELECTION_DEBOUNCE_DELAY (int): Delay in milliseconds without new map selection before the Python
+                selection callback runs.
         """
         self.handler = handler
         self.latitude = visualizer_config.LATITUDE_LYON
@@ -444,9 +776,11 @@ class BokehVisualizer:
         self.p_line = figure()
         self.data_table = DataTable()
         self.data_table_url = DataTable()
-        self.selection_callback = None
         self.switch_plot_button = RadioButtonGroup()
+        self.axis_range_dates = None
+        self.axis_range_bounds = None
         self.update_frequency = visualizer_config.UPDATE_FREQUENCY
+        self.selection_debounce_delay = visualizer_config.SELECTION_DEBOUNCE_DELAY
         self.bokeh_layout = column()
 
     def create_map_plot(self):
@@ -459,10 +793,12 @@ class BokehVisualizer:
         source_map = self.handler.source_map
         zoom_level =self.zoom_level
 
+        # Without low and high bounds, the browser infers them from the current data, so colors
+        # follow the patched available spaces without any min/max computed in Python
         color_mapper = linear_cmap(field_name="nombre_de_places_disponibles",
                                 palette="Viridis256",
-                                low=min(source_map.data["nombre_de_places_disponibles"]),
-                                high=max(source_map.data["nombre_de_places_disponibles"]))
+                                low=None,
+                                high=None)
 
         hover_map = HoverTool(
             tooltips = [
@@ -504,29 +840,35 @@ class BokehVisualizer:
         """
         Computes padded axis ranges for a Bokeh plot.
 
+        The bounds are computed once per version of the "source_history" dates: stream and full
+        assignments replace the dates array, so the step and line plots share the same computation.
+
         Returns:
         - tuple: Two Range1d objects representing x and y ranges with padding.
+
+        Updates Attributes:
+        - axis_range_dates (np.ndarray): "source_history" dates the cached bounds were computed from.
+        - axis_range_bounds (tuple): Cached x start, x end, y start and y end.
         """
         source_history = self.handler.source_history
         x_dates = source_history.data['date']
-        y_values = source_history.data['nombre_de_places_disponibles']
-        
-        if isinstance(x_dates[0], str):
-            x_dates = pd.to_datetime(x_dates).astype(int)
 
-        x_min = np.nanmin(x_dates)
-        x_max = np.nanmax(x_dates)
-        y_min = np.nanmin(y_values)
-        y_max = np.nanmax(y_values)
-    
-        x_pad = 0.1 * (x_max - x_min)
-        y_pad = 0.1 * (y_max - y_min)
+        if x_dates is not self.axis_range_dates:
+            y_values = source_history.data['nombre_de_places_disponibles']
+            x_datetimes = np.asarray(x_dates, dtype='datetime64[ns]')
+
+            x_min = np.nanmin(x_datetimes)
+            x_max = np.nanmax(x_datetimes)
+            y_min = np.nanmin(y_values)
+            y_max = np.nanmax(y_values)
 
-        x_start = x_min - x_pad
-        x_end = x_max + x_pad
-        y_start  = y_min - y_pad
-        y_end  = y_max + y_pad
+            x_pad = 0.1 * (x_max - x_min)
+            y_pad = 0.1 * (y_max - y_min)
 
+            self.axis_range_dates = x_dates
+            self.axis_range_bounds = (x_min - x_pad, x_max + x_pad, y_min - y_pad, y_max + y_pad)
+
+        x_start, x_end, y_start, y_end = self.axis_range_bounds
         x_range = Range1d(start=x_start, end=x_end)
         y_range = Range1d(start=y_start, end=y_end)
 
@@ -699,109 +1041,45 @@ class BokehVisualizer:
 
         self.switch_plot_button = button_group
 
-    def create_selection_callback(self):
+    def update_axis_ranges(self):
         """
-        Creates a CustomJS callback for updating "ColumnDataSource" and "Figure" object based on user selection.
-        
-        Updates Attributes:
-        - selection_callback (CustomJS): The JavaScript callback.
-        """
-        selection_callback = CustomJS(
-            args=dict(
-                s_original=self.handler.source_original,
-                s_map=self.handler.source_map,
-                s_history=self.handler.source_history,
-                s_table=self.handler.source_table,
-                p_step=self.p_step,
-                p_line=self.p_line),
-            code=
-            """
-            var map_data = s_map.data
-            var original_data = s_original.data
-            var selected_index = cb_obj.indices[0]
-                                            
-            if (selected_index !== undefined) {
-                var parking_id = map_data['identifier'][selected_index]
-
-                // Update s_history
-                var history_data = {};
-                for (var key in original_data) {
-                    history_data[key] = [];
-                }
-
-                for (var i = 0; i < original_data['parking_id'].length; i++) {
-                    if (original_data['parking_id'][i] === parking_id) {
-                        for (var key in original_data) {
-                            history_data[key].push(original_data[key][i]);
-                        }
-                    }
-                }
-
-                s_history.data = history_data
-                s_history.change.emit()
-
-                // Specify new axis range for the history plots 
-                var x_min = Math.min(...history_data['date'].map(d => new Date(d).getTime()));
-                var x_max = Math.max(...history_data['date'].map(d => new Date(d).getTime()));
-                var y_min = Math.min(...history_data['nombre_de_places_disponibles']);
-                var y_max = Math.max(...history_data['nombre_de_places_disponibles']);
-
-                var x_padding = 0.1 * (x_max - x_min);
-                var y_padding = 0.1 * (y_max - y_min);
-
-                p_step.x_range.setv({ start: x_min - x_padding, end: x_max + x_padding });
-                p_step.y_range.setv({ start: y_min - y_padding, end: y_max + y_padding });
-                p_line.x_range.setv({ start: x_min - x_padding, end: x_max + x_padding });
-                p_line.y_range.setv({ start: y_min - y_padding, end: y_max + y_padding });
-                p_step.change.emit();
-                p_line.change.emit();
-                
-                // Update s_table
-                var max_date_index = 0
-                var max_date = new Date(Math.max(...history_data['date'].map(d => new Date(d))))
-
-                for (var i = 0; i < history_data['date'].length; i++) {
-                    if (new Date(history_data['date'][i]).getTime() === max_date.getTime()) {
-                        max_date_index = i;
-                        break;
-                    }
-                }
-
-                var filter_columns = ["parking", "heure", "capacité_total", "nombre_de_places_disponibles", "nombre de niveaux", "hauteur limite (mètre)", "téléphone", "tarifs", "adresse"];
-                var table_data = {
-                    "Field": [],
-                    "Value": []
-                };
+        Fits the axis ranges of the step and line plots to the history held in "source_history".
 
-                for (var key of filter_columns) {
-                    var value =history_data[key][max_date_index];
-
-                    table_data["Field"].push(key);
-                    table_data["Value"].push(value);
-                }
+        Updates Attributes:
+        - p_step (Figure): Bokeh step plot.
+        - p_line (Figure): Bokeh line plot.
+        """
+        x_range, y_range = self.get_axis_range()
 
-                s_table.data = table_data
-            }
-            """
-            )
-        self.selection_callback = selection_callback
+        for p in (self.p_step, self.p_line):
+            p.x_range.update(start=x_range.start, end=x_range.end)
+            p.y_range.update(start=y_range.start, end=y_range.end)
 
     def get_current_parking_id(self, attr, old, new):
         """
-        Updates the current parking ID based on user selection.
+        Updates the current parking ID based on user selection, and the history plots and table accordingly.
 
         Parameters:
         - attr (str): Attribute triggered by the callback.
         - old: Previous selected value.
         - new (list[int]): New selected value (index of the selection).
 
+        Only the history of the selected parking is sent to the browser, the full history of every parking
+        stays in "handler.df_global" on the server.
+
         Updates Attributes:
         - handler.current_parking_id (str): The ID of the parking selected by the user, extracted from 
             "self.handler.source_map.data["parking_id"] using the provided index.
+        - handler.source_history (ColumnDataSource): History of the selected parking.
+        - handler.source_table (ColumnDataSource): Details of the selected parking.
+        - p_step (Figure): Bokeh step plot.
+        - p_line (Figure): Bokeh line plot.
         """
         if new:
             selected_index = new[0]
             self.handler.current_parking_id = self.handler.source_map.data['parking_id'][selected_index]
+            self.handler.update_history_sources()
+            self.update_axis_ranges()
 
     def get_layout_title(self):
         """
@@ -865,25 +1143,56 @@ def validate_env_password(pgsql_config):
         logger.critical(error_msg, exc_info=True)
         raise EnvironmentError(error_msg)
 
+def debounce(callback, doc, wait):
+    """
+    Wraps a Bokeh "on_change" callback so that it runs once a burst of changes has settled.
+
+    Each change cancels the pending run, if any, and schedules a new one "wait" milliseconds later
+    on the document, so only the last change of a burst reaches "callback".
+
+    Parameters:
+    - callback (callable): Callback with the (attr, old, new) "on_change" signature.
+    - doc (Document): Bokeh Document on which the delayed runs are scheduled.
+    - wait (int): Delay in milliseconds without new change before "callback" runs.
+
+    Returns:
+    - callable: The debounced callback, with the same signature as "callback".
+    """
+    pending_callbacks = []
+
+    def debounced_callback(attr, old, new):
+        if pending_callbacks:
+            doc.remove_timeout_callback(pending_callbacks.pop())
+
+        def delayed_callback():
+            pending_callbacks.clear()
+            callback(attr, old, new)
+
+        pending_callbacks.append(doc.add_timeout_callback(delayed_callback, wait))
+
+    return debounced_callback
+
 def latlon_to_webmercator(lat, lon):
         """
         Convert latitude and longitude to Web Mercator coordinates.
+
+        Accepts scalars or NumPy arrays, so a whole DataFrame column can be converted in one call.
         
         Parameters:
-        - lat (float): Latitude in degrees
-        - lon (float): Longitude in degrees
+        - lat (float or np.ndarray): Latitude in degrees
+        - lon (float or np.ndarray): Longitude in degrees
         
         Returns:
-        - (float, float): Web Mercator x, y coordinates
+        - (float, float) or (np.ndarray, np.ndarray): Web Mercator x, y coordinates
         """
 
         R = 6378137  # Radius of the Earth in meters (WGS 84 standard)
-        x = R * math.radians(lon)  # Convert longitude to radians and scale
-        y = R * math.log(math.tan(math.pi / 4 + math.radians(lat) / 2))  # Transform latitude
+        x = R * np.radians(lon)  # Convert longitude to radians and scale
+        y = R * np.log(np.tan(np.pi / 4 + np.radians(lat) / 2))  # Transform latitude
 
         return x, y
 
-def main():
+def main(database_connection_error_count=0):
     """
     Main fucntion to produce interactive automatically updated Bokeh Layout. 
     
@@ -892,12 +1201,15 @@ def main():
         - fetchs and process data,
         - prepares Bokeh ColumnDataSource objects,
         - builds an interactive Bokeh layout with a map, trend chart, and data table.
-        - periodically fetches updates from the PostgreSQL database and synchronizes the visualizations.
+        - periodically fetches updates from the PostgreSQL database on a worker thread and synchronizes the visualizations.
+
+    Note: Errors are logged, with up to "MAX_CONNECTION_RETRIES" retries for database connection issues before
+    stopping execution. Retries are scheduled on the document, so the Bokeh server is not blocked while waiting.
 
-    Note: Errors are logged, with up to five retries for database connection issues before stopping execution.
+    Parameters:
+    - database_connection_error_count (int): Number of failed database connection attempts so far.
     """
     logger.info("Main process launched!")
-    database_connection_error_count = 0
     pgsql_config = PgsqlConfig()
     handler_config = DataHandlerConfig()
     visualizer_config = BokehVisualizerConfig()
@@ -917,28 +1229,70 @@ def main():
         visualizer.create_data_table()
         visualizer.create_data_table_url()
         visualizer.create_switch_plot_button()
-        
-        visualizer.create_selection_callback()
 
-        # Update step, line, data_table, data_url on user selection
-        visualizer.handler.source_map.selected.js_on_change('indices', visualizer.selection_callback)
-        # Update current_parking_id on user selection
-        visualizer.handler.source_map.selected.on_change('indices', visualizer.get_current_parking_id)
+        # Update current_parking_id, step, line, data_table, data_url on user selection,
+        # once a burst of selections has settled
+        visualizer.handler.source_map.selected.on_change(
+            'indices',
+            debounce(visualizer.get_current_parking_id, curdoc(), visualizer.selection_debounce_delay)
+            )
 
         layout = visualizer.create_layout()
         
-        curdoc().add_root(layout)  
-        curdoc().add_periodic_callback(visualizer.handler.update_sources, visualizer.update_frequency)
+        doc = curdoc()
+        executor = ThreadPoolExecutor(max_workers=1)
+
+        def update_sources_on_hold(global_data):
+            # Successive changes of the sources are combined while the document is on hold,
+            # then sent to the browser together
+            doc.hold('combine')
+            try:
+                handler.update_sources(*global_data)
+            finally:
+                doc.unhold()
+
+        @without_document_lock
+        async def update_sources_in_background():
+            # Database I/O and merges run on a worker thread, so the document keeps serving websocket
+            # messages; only the source updates are scheduled back on the document thread.
+            start_time = time.monotonic()
+            try:
+                global_data = await asyncio.get_running_loop().run_in_executor(executor, handler.get_global_dataframe)
+                doc.add_next_tick_callback(partial(update_sources_on_hold, global_data))
+            finally:
+                # The next update is only scheduled once this one is done, and is delayed further when
+                # the database is slow, so that updates never pile up
+                update_duration = int((time.monotonic() - start_time) * 1000)
+                doc.add_timeout_callback(
+                    update_sources_in_background,
+                    max(visualizer.update_frequency, 2 * update_duration)
+                    )
+
+        def release_resources(session_context):
+            # Release the session's worker thread and pooled PostgreSQL connections when the user leaves
+            executor.shutdown(wait=False)
+            handler.dispose_engine()
+
+        doc.add_root(layout)  
+        doc.add_timeout_callback(update_sources_in_background, visualizer.update_frequency)
+        doc.on_session_destroyed(release_resources)
 
     except DatabaseOperationError:
         database_connection_error_count += 1
         error_msg = f"Database connection attempt failed. Total failures: {database_connection_error_count}"
         logger.warning(error_msg, exc_info=True)
 
-        if database_connection_error_count > 5:
-            logger.critical("Database connection attempt failed over 5 times. Script stopped!")
+        if database_connection_error_count > pgsql_config.MAX_CONNECTION_RETRIES:
+            logger.critical(
+                f"Database connection attempt failed over {pgsql_config.MAX_CONNECTION_RETRIES} times. Script stopped!"
+                )
             raise
-        time.sleep(60)
+        curdoc().add_timeout_callback(
+            partial(main, database_connection_error_count),
+            pgsql_config.CONNECTION_RETRY_DELAY
+            )
 
-main()
+# "bokeh serve" runs this script under a generated "bokeh_app_<id>" module name
+if __name__ == "__main__" or __name__.startswith("bokeh_app"):
+    main()
 
@@ -2,9 +2,18 @@
 Unit tests for functions of module plot_realtime.py.
 
 This script provides test cases for the following methods of DataHandler class:
+- get_address,
+- get_parking_capacity,
+- clean_phone_number,
 - get_realtime_dataframe,
 - validate_realtime_df_columns,
-- add_circle_size_to_source_map.
+- categorize_parking_id,
+- add_circle_size_to_source_map,
+- update_history_sources,
+- update_sources.
+
+And for the module function:
+- debounce.
 """
 import os
 import sys
@@ -15,7 +24,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../src/
 from bokeh.models import ColumnDataSource
 import numpy as np
 import pandas as pd
-from scripts.plot_realtime import DatabaseOperationError, DataHandler
+from scripts.plot_realtime import DatabaseOperationError, DataHandler, debounce
 from scripts.config.config import DataHandlerConfig, PgsqlConfig
 import unittest
 from unittest.mock import MagicMock, patch
@@ -30,6 +39,40 @@ class TestDataHandler(unittest.TestCase):
         self.handler = DataHandler(mock_csv_filepath, pgsql_config, handler_config)   
 
 
+    def test_get_address(self):
+        """Test case where address fields are extracted whatever their order and quoting."""
+
+        address_series = pd.Series([
+            "\"{'schema:postalCode': 69001, 'schema:streetAddress': 'place Louis Pradel', 'schema:addressCountry': 'France', 'schema:addressLocality': 'Lyon'}\"",
+            "{'schema:postalCode': 69002, 'schema:streetAddress': Centre d'échange Lyon Perrache\", 'schema:addressCountry': 'France', 'schema:addressLocality': 'Lyon'}\"",
+        ])
+
+        result = DataHandler.get_address(address_series)
+
+        self.assertEqual(result[0], "place Louis Pradel 69001 Lyon")
+        self.assertEqual(result[1], "Centre d'échange Lyon Perrache 69002 Lyon")
+
+
+    def test_get_parking_capacity(self):
+        """Test case where the capacity of the last dictionary is returned, even if a value is not reported."""
+
+        capacity_str = "[{'mv:userGroup': , 'mv:maximumValue': 4}, {'mv:userGroup': , 'mv:maximumValue': 200}]"
+
+        self.assertEqual(DataHandler.get_parking_capacity(capacity_str), 200)
+        self.assertEqual(DataHandler.get_parking_capacity("[{'mv:maximumValue': 4}, {'mv:userGroup': }]"), "not reported")
+
+
+    def test_clean_phone_number(self):
+        """Test case where phone numbers are formatted and missing values are kept."""
+
+        phone_series = pd.Series([478397585.0, np.nan])
+
+        result = DataHandler.clean_phone_number(phone_series)
+
+        self.assertEqual(result[0], "04 78 39 75 85")
+        self.assertTrue(pd.isna(result[1]), "Missing phone numbers should stay missing.")
+
+
     @patch("scripts.plot_realtime.create_engine")
     def test_get_realtime_dataframe_connexion_failed(self, mock_create_engine):
         """Test case where connexion to database fail."""
@@ -88,6 +131,20 @@ class TestDataHandler(unittest.TestCase):
         self.assertTrue(mock_read_sql_query.called)
 
 
+    @patch("scripts.plot_realtime.pd.read_sql_query")
+    @patch("scripts.plot_realtime.create_engine")
+    def test_get_realtime_dataframe_since_empty(self, mock_create_engine, mock_read_sql_query):
+        """Test case where no record is newer than the specified date."""
+
+        mock_read_sql_query.return_value = pd.DataFrame(columns=list(self.handler.required_columns_set))
+        since = pd.Timestamp('2024-12-15 10:00')
+
+        df_realtime = self.handler.get_realtime_dataframe(since=since)
+
+        self.assertTrue(df_realtime.empty)
+        self.assertEqual(mock_read_sql_query.call_args.kwargs["params"], {"since": since})
+
+
     def test_validate_realtime_df_columns_valid(self):
         """Test case where the dataframe has the required columns."""
 
@@ -116,6 +173,21 @@ class TestDataHandler(unittest.TestCase):
             error message raised: {context.exception}"""
             )
         
+    def test_categorize_parking_id(self):
+        """Test case where real-time and general information parking IDs share the same categories, including unknown IDs."""
+        self.handler.df_general_info = pd.DataFrame({'identifier': ['ID2', 'ID1']})
+        df_realtime = pd.DataFrame({'parking_id': ['ID1', 'ID3']})
+
+        result, parking_id_dtype, general_info_by_code = self.handler.categorize_parking_id(df_realtime)
+
+        self.assertListEqual(list(result['parking_id'].cat.categories), ['ID1', 'ID2', 'ID3'])
+        self.assertEqual(parking_id_dtype, result['parking_id'].dtype)
+        self.assertEqual(general_info_by_code['identifier'].dtype, result['parking_id'].dtype)
+        self.assertListEqual(general_info_by_code['identifier'].tolist()[:2], ['ID1', 'ID2'])
+        self.assertListEqual(result['parking_id'].tolist(), ['ID1', 'ID3'])
+        self.assertIsNone(self.handler.parking_id_dtype, "Categorization should be stored by update_sources only.")
+
+
     def test_add_circle_size_to_source_map_single_value(self):
         """Test case where "nombre_de_places_disponibles" column has a single unique value."""
         
@@ -127,7 +199,7 @@ class TestDataHandler(unittest.TestCase):
         self.handler.add_circle_size_to_source_map()
 
         self.assertListEqual(
-            self.handler.source_map.data["normalized_circle_size"],
+            self.handler.source_map.data["normalized_circle_size"].tolist(),
             target_circle_size
             ,
             """The 'normalized_circle_size' values should be equal to the mean of 'circle_size_bounds' attributs."""
@@ -144,7 +216,7 @@ class TestDataHandler(unittest.TestCase):
         self.handler.add_circle_size_to_source_map()
 
         self.assertListEqual(
-            self.handler.source_map.data["normalized_circle_size"],
+            self.handler.source_map.data["normalized_circle_size"].tolist(),
             target_circle_size
             ,
             """The 'normalized_circle_size' values should be equal to the mean of 'circle_size_bounds' attributs."""
@@ -161,12 +233,219 @@ class TestDataHandler(unittest.TestCase):
         self.handler.add_circle_size_to_source_map()
 
         self.assertListEqual(
-            self.handler.source_map.data["normalized_circle_size"],
+            self.handler.source_map.data["normalized_circle_size"].tolist(),
             target_circle_size
             ,
             """The 'normalized_circle_size' values are not equal to expectation."""
         )
 
+    def set_update_sources_test_data(self):
+        """Set general information for two parkings and return a first batch of real-time records."""
+        self.handler.current_parking_id = 'ID1'
+        self.handler.df_general_info = pd.DataFrame({
+            'identifier': ['ID1', 'ID2'],
+            'parking': ['Parking 1', 'Parking 2'],
+            'site_web': ['url1', 'url2'],
+            'adresse': ['adresse 1', 'adresse 2'],
+            'nombre de niveaux': [1, 2],
+            'hauteur limite (mètre)': [2.0, 2.1],
+            'téléphone': ['01 00 00 00 01', '01 00 00 00 02'],
+            'tarifs': [' ', ' '],
+            'lon_mercator': [0.0, 1.0],
+            'lat_mercator': [0.0, 1.0],
+            'capacité_total': [100, 200],
+        })
+        first_batch = pd.DataFrame({
+            'parking_id': ['ID1', 'ID2', 'ID1'],
+            'nombre_de_places_disponibles': [10, 20, 11],
+            'date': pd.to_datetime(['2024-12-15 10:00', '2024-12-15 10:00', '2024-12-15 10:10']),
+        })
+
+        return first_batch
+
+    def test_update_sources_streams_new_rows(self):
+        """Test case where a second update only fetches and streams rows newer than the previous update."""
+        first_batch = self.set_update_sources_test_data()
+        second_batch = pd.DataFrame({
+            'parking_id': ['ID2', 'ID1'],
+            'nombre_de_places_disponibles': [21, 12],
+            'date': pd.to_datetime(['2024-12-15 10:20', '2024-12-15 10:30']),
+        })
+
+        with patch.object(self.handler, "get_realtime_dataframe", side_effect=[first_batch, second_batch]) as mock_fetch:
+            self.handler.update_sources()
+            with patch.object(ColumnDataSource, "stream", autospec=True, side_effect=ColumnDataSource.stream) as mock_stream:
+                self.handler.update_sources()
+
+        self.assertEqual(mock_fetch.call_args.kwargs, {'since': first_batch['date'].max()})
+
+        source, streamed_data = mock_stream.call_args.args[:2]
+        self.assertIs(source, self.handler.source_history)
+        self.assertListEqual(
+            streamed_data['nombre_de_places_disponibles'].tolist(), [12], "Only the new rows of ID1 should be streamed."
+            )
+        self.assertListEqual(self.handler.source_history.data['nombre_de_places_disponibles'].tolist(), [10, 11, 12])
+
+    def test_update_history_sources_selected_parking_changed(self):
+        """Test case where only the history of a newly selected parking replaces "source_history"."""
+        first_batch = self.set_update_sources_test_data()
+
+        with patch.object(self.handler, "get_realtime_dataframe", return_value=first_batch):
+            self.handler.update_sources()
+
+        self.handler.current_parking_id = 'ID2'
+        self.handler.update_history_sources()
+
+        self.assertListEqual(list(self.handler.source_history.data), self.handler.source_history_columns)
+        self.assertListEqual(self.handler.source_history.data['parking'].tolist(), ['Parking 2'])
+        fields = self.handler.source_table.data['Field']
+        self.assertEqual(self.handler.source_table.data['Value'][fields.index('nombre_de_places_disponibles')], 20)
+        self.assertEqual(self.handler.history_parking_id, 'ID2')
+
+    def test_update_sources_patches_changed_map_cells(self):
+        """Test case where a second update only patches the map cells of the parking that changed."""
+        first_batch = self.set_update_sources_test_data()
+        second_batch = pd.DataFrame({
+            'parking_id': ['ID2'],
+            'nombre_de_places_disponibles': [21],
+            'date': pd.to_datetime(['2024-12-15 10:20']),
+        })
+
+        with patch.object(self.handler, "get_realtime_dataframe", side_effect=[first_batch, second_batch]):
+            self.handler.update_sources()
+            with patch.object(ColumnDataSource, "patch", autospec=True, side_effect=ColumnDataSource.patch) as mock_patch:
+                self.handler.update_sources()
+
+        source, patches = mock_patch.call_args.args[:2]
+        self.assertIs(source, self.handler.source_map)
+        self.assertSetEqual(set(patches), {'nombre_de_places_disponibles'})
+        for column_patches in patches.values():
+            self.assertListEqual([index for index, _ in column_patches], [1], "Only parking ID2 should be patched.")
+        self.assertListEqual(self.handler.source_map.data['nombre_de_places_disponibles'].tolist(), [11, 21])
+
+    def test_update_sources_patches_parking_without_general_info(self):
+        """Test case where a parking missing from the general information is patched on the map like the others."""
+        first_batch = self.set_update_sources_test_data()
+        text_columns = ['parking', 'site_web', 'adresse', 'téléphone', 'tarifs']
+        self.handler.df_general_info[text_columns] = self.handler.df_general_info[text_columns].astype("string")
+        first_batch = pd.concat([first_batch, pd.DataFrame({
+            'parking_id': ['ID3'],
+            'nombre_de_places_disponibles': [30],
+            'date': pd.to_datetime(['2024-12-15 10:10']),
+        })], ignore_index=True)
+        second_batch = pd.DataFrame({
+            'parking_id': ['ID3'],
+            'nombre_de_places_disponibles': [31],
+            'date': pd.to_datetime(['2024-12-15 10:20']),
+        })
+
+        with patch.object(self.handler, "get_realtime_dataframe", side_effect=[first_batch, second_batch]):
+            self.handler.update_sources()
+            with patch.object(ColumnDataSource, "patch", autospec=True, side_effect=ColumnDataSource.patch) as mock_patch:
+                self.handler.update_sources()
+
+        source, patches = mock_patch.call_args.args[:2]
+        self.assertIs(source, self.handler.source_map)
+        self.assertListEqual(patches['nombre_de_places_disponibles'], [(2, 31)])
+        self.assertListEqual(self.handler.source_map.data['parking_id'].tolist(), ['ID1', 'ID2', 'ID3'])
+        self.assertIsNone(self.handler.source_map.data['parking'][2], "Missing names should be sent as None.")
+
+    def test_update_sources_drops_parkings_out_of_window(self):
+        """Test case where a parking whose most recent record left the time window is removed from the map."""
+        first_batch = self.set_update_sources_test_data()
+        second_batch = pd.DataFrame({
+            'parking_id': ['ID1'],
+            'nombre_de_places_disponibles': [12],
+            'date': pd.to_datetime(['2025-01-15 10:00']),
+        })
+
+        with patch.object(self.handler, "get_realtime_dataframe", side_effect=[first_batch, second_batch]):
+            self.handler.update_sources()
+            self.handler.update_sources()
+
+        self.assertListEqual(self.handler.source_map.data['parking_id'].tolist(), ['ID1'])
+        self.assertListEqual(self.handler.source_map.data['nombre_de_places_disponibles'].tolist(), [12])
+
+    def test_update_sources_patches_changed_table_values(self):
+        """Test case where a second update only patches the table values of the selected parking that changed."""
+        first_batch = self.set_update_sources_test_data()
+        second_batch = pd.DataFrame({
+            'parking_id': ['ID1'],
+            'nombre_de_places_disponibles': [12],
+            'date': pd.to_datetime(['2024-12-15 10:20']),
+        })
+
+        with patch.object(self.handler, "get_realtime_dataframe", side_effect=[first_batch, second_batch]):
+            self.handler.update_sources()
+            with patch.object(ColumnDataSource, "patch", autospec=True, side_effect=ColumnDataSource.patch) as mock_patch:
+                self.handler.update_sources()
+
+        table_patches = [call.args[1] for call in mock_patch.call_args_list if call.args[0] is self.handler.source_table]
+        self.assertEqual(len(table_patches), 1)
+        fields = self.handler.source_table.data['Field']
+        patched_fields = {fields[index] for index, _ in table_patches[0]['Value']}
+        self.assertSetEqual(patched_fields, {'heure', 'nombre_de_places_disponibles'})
+        self.assertEqual(self.handler.source_table.data['Value'][fields.index('nombre_de_places_disponibles')], 12)
+
+    def test_update_sources_patches_table_with_missing_values(self):
+        """Test case where missing "parking" and "tarifs" values of the selected parking are left unpatched."""
+        first_batch = self.set_update_sources_test_data()
+        text_columns = ['parking', 'site_web', 'adresse', 'téléphone', 'tarifs']
+        self.handler.df_general_info[text_columns] = self.handler.df_general_info[text_columns].astype("string")
+        self.handler.df_general_info.loc[self.handler.df_general_info.index[0], ['parking', 'tarifs']] = pd.NA
+        second_batch = pd.DataFrame({
+            'parking_id': ['ID1'],
+            'nombre_de_places_disponibles': [12],
+            'date': pd.to_datetime(['2024-12-15 10:20']),
+        })
+
+        with patch.object(self.handler, "get_realtime_dataframe", side_effect=[first_batch, second_batch]):
+            self.handler.update_sources()
+            with patch.object(ColumnDataSource, "patch", autospec=True, side_effect=ColumnDataSource.patch) as mock_patch:
+                self.handler.update_sources()
+
+        table_patches = [call.args[1] for call in mock_patch.call_args_list if call.args[0] is self.handler.source_table]
+        self.assertEqual(len(table_patches), 1)
+        fields = self.handler.source_table.data['Field']
+        patched_fields = {fields[index] for index, _ in table_patches[0]['Value']}
+        self.assertSetEqual(patched_fields, {'heure', 'nombre_de_places_disponibles'})
+        self.assertTrue(pd.isna(self.handler.source_table.data['Value'][fields.index('tarifs')]))
+
+    def test_update_sources_without_new_records(self):
+        """Test case where no source is modified when no new record is fetched and the selected parking is unchanged."""
+        first_batch = self.set_update_sources_test_data()
+        second_batch = first_batch.iloc[0:0]
+
+        with patch.object(self.handler, "get_realtime_dataframe", side_effect=[first_batch, second_batch]):
+            self.handler.update_sources()
+            with patch.object(ColumnDataSource, "stream") as mock_stream, \
+                    patch.object(self.handler, "patch_source_map") as mock_patch_source_map:
+                self.handler.update_sources()
+
+        mock_stream.assert_not_called()
+        mock_patch_source_map.assert_not_called()
+
+
+class TestDebounce(unittest.TestCase):
+    def test_debounce_runs_last_change_only(self):
+        """Test case where a burst of changes cancels pending runs and only the last change reaches the callback."""
+        callback = MagicMock()
+        doc = MagicMock()
+        doc.add_timeout_callback.side_effect = ['timeout 1', 'timeout 2']
+        debounced_callback = debounce(callback, doc, 150)
+
+        debounced_callback('indices', [], [0])
+        debounced_callback('indices', [0], [1])
+
+        doc.remove_timeout_callback.assert_called_once_with('timeout 1')
+        callback.assert_not_called()
+
+        delayed_callback, wait = doc.add_timeout_callback.call_args.args
+        delayed_callback()
+
+        self.assertEqual(wait, 150)
+        callback.assert_called_once_with('indices', [0], [1])
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file